@@ -60,13 +60,11 @@ class ProductAdmin(admin.ModelAdmin):
 
     @admin.display(description="Title (DE)")
     def title_de(self, obj):
-        tr = obj.translations.filter(language="de").first()
-        return tr.title if tr else "-"
+        return obj.display_title_de or "-"
 
     @admin.display(description="Title (AR)")
     def title_ar(self, obj):
-        tr = obj.translations.filter(language="ar").first()
-        return tr.title if tr else "-"
+        return obj.display_title_ar or "-"
 
     @admin.display(description="Image")
     def thumb(self, obj):
@@ -120,7 +118,9 @@ class CategoryAdmin(admin.ModelAdmin):
 
     @admin.display(description="Products", ordering="_product_count")
     def product_count(self, obj):
-        return getattr(obj, "_product_count", None) or obj.products.count()
+        count = getattr(obj, "_product_count", None)
+        # 0 is a valid annotation; only query when the annotation is missing
+        return count if count is not None else obj.products.count()
 
     def save_model(self, request, obj, form, change):
         # Translate in admin before save for immediate feedback
@@ -128,6 +128,7 @@ class CategoryAdmin(admin.ModelAdmin):
             obj.name_ar = translate_text(obj.name_de, target_lang="ar", source_lang="de")
         elif obj.name_ar and not obj.name_de:
             obj.name_de = translate_text(obj.name_ar, target_lang="de", source_lang="ar")
+        obj._skip_translate = True  # Category.save() must not translate again
         super().save_model(request, obj, form, change)
 
 
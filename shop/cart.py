@@ -1,9 +1,17 @@
 # shop/cart.py
 from decimal import Decimal
 from django.utils.translation import gettext as _
-from django.db.models import Prefetch
+from django.db.models import Case, DecimalField, F, IntegerField, Sum, Value, When
+from django.db.models.functions import Coalesce
 
 CART_KEY = "cart"
+COUNT_KEY = "_count"        # cached item count (navbar)
+SUBTOTAL_KEY = "_subtotal"  # cached subtotal as str(Decimal)
+LINE_FIELDS = (  # what cart.html renders
+    "id", "sku", "price", "sale_price", "slug", "image",
+    "display_title_de", "display_title_ar",
+    "category", "category__name_de", "category__name_ar",
+)
 
 
 def _ensure(session):
@@ -12,6 +20,49 @@ def _ensure(session):
     return session[CART_KEY]
 
 
+def _items(cart):
+    """Yield (pid, meta) pairs, skipping the cached-total keys."""
+    return ((pid, meta) for pid, meta in cart.items() if not pid.startswith("_"))
+
+
+def _parsed(session):
+    """
+    {product_id: (qty, price)} with int ids/qtys and Decimal (or None) prices.
+
+    The session keeps JSON-safe strings; this is parsed once and memoized on
+    the session object for the rest of the request. Mutators drop it.
+    """
+    parsed = getattr(session, "_parsed_cart", None)
+    if parsed is None:
+        parsed = {}
+        for pid, meta in _items(session.get(CART_KEY) or {}):
+            try:
+                price = Decimal(str(meta["price"])) if "price" in meta else None
+            except Exception:
+                price = None
+            parsed[int(pid)] = (int(meta.get("qty", 1)), price)
+        session._parsed_cart = parsed
+    return parsed
+
+
+def _compute_totals(session):
+    """Sum qty and price*qty from the parsed session cart (no DB)."""
+    count = 0
+    subtotal = Decimal("0")
+    for qty, price in _parsed(session).values():
+        count += qty
+        if price is not None:
+            subtotal += price * qty
+    return count, subtotal
+
+
+def _refresh_totals(session, cart):
+    session._parsed_cart = None  # cart changed; re-parse below
+    count, subtotal = _compute_totals(session)
+    cart[COUNT_KEY] = count
+    cart[SUBTOTAL_KEY] = str(subtotal)
+
+
 def add(session, product_id: int, qty: int = 1, price: Decimal | float | str | None = None):
     cart = _ensure(session)
     pid = str(product_id)
@@ -20,6 +71,7 @@ def add(session, product_id: int, qty: int = 1, price: Decimal | float | str | N
     if price is not None:
         item["price"] = str(price)
     cart[pid] = item
+    _refresh_totals(session, cart)
     session.modified = True
     return cart
 
@@ -33,17 +85,36 @@ def set_qty(session, product_id: int, qty: int):
         item = cart.get(pid, {})
         item["qty"] = int(qty)
         cart[pid] = item
+    _refresh_totals(session, cart)
     session.modified = True
 
 
 def remove(session, product_id: int):
     cart = _ensure(session)
     cart.pop(str(product_id), None)
+    _refresh_totals(session, cart)
     session.modified = True
 
 
 def clear(session):
     session[CART_KEY] = {}
+    session._parsed_cart = None
+    session.modified = True
+
+
+def _drop_missing(session, existing_ids):
+    """
+    Remove cart entries whose product no longer exists (deleted since it was
+    added) and refresh the cached totals, so the navbar count matches the
+    lines the cart can actually show.
+    """
+    missing = [pid for pid in _parsed(session) if pid not in existing_ids]
+    if not missing:
+        return
+    cart = _ensure(session)
+    for pid in missing:
+        cart.pop(str(pid), None)
+    _refresh_totals(session, cart)
     session.modified = True
 
 
@@ -51,43 +122,112 @@ def items_with_products(session, ProductModel):
     """
     Returns list of dicts: {product, qty, unit_price, line_total}
 
-    Now fetches products with category + translations prefetched so
-    the view can show localized titles without extra queries.
+    Fetches products with category joined; localized titles are the
+    denormalized display_title_<lang> columns, so no translations query.
     """
-    cart = _ensure(session)
-    if not cart:
+    parsed = _parsed(session)
+    if not parsed:
         return []
-    ids = [int(pid) for pid in cart.keys()]
 
     products_qs = (
         ProductModel.objects
-        .filter(id__in=ids)
+        .filter(id__in=parsed.keys())
+        .only(*LINE_FIELDS)
         .select_related("category")
-        .prefetch_related("translations")  # p.translations usable; views fallback if no tr_list attr
     )
 
     products = {p.id: p for p in products_qs}
-    out = []
-    for pid, meta in cart.items():
-        p = products.get(int(pid))
-        if not p:
-            continue
-        unit = getattr(p, "sale_price", None) or getattr(p, "price", None)
-        try:
-            unit = Decimal(str(unit))
-        except Exception:
-            unit = Decimal("0")
-        qty = int(meta.get("qty", 1))
-        out.append({
-            "product": p,
-            "qty": qty,
-            "unit_price": unit,
-            "line_total": unit * qty,
-        })
-    return out
+    _drop_missing(session, products)
+    return [_line(products[pid], qty) for pid, (qty, _price) in _parsed(session).items()]
+
+
+def _unit_price(product) -> Decimal:
+    unit = product.sale_price or product.price
+    try:
+        return Decimal(str(unit))
+    except Exception:
+        return Decimal("0")
+
+
+def _line(product, qty: int):
+    unit = _unit_price(product)
+    return {
+        "product": product,
+        "qty": qty,
+        "unit_price": unit,
+        "line_total": unit * qty,
+    }
 
 
 def totals(session, ProductModel):
     lines = items_with_products(session, ProductModel)
     subtotal = sum((li["line_total"] for li in lines), start=Decimal("0"))
     return {"subtotal": subtotal, "lines": lines}
+
+
+def quick_totals(session):
+    """
+    Returns (count, subtotal) from the cached session values — zero DB hits.
+
+    Meant for the navbar counter; views that render line items should keep
+    using `totals()` which reflects live product prices.
+    """
+    cart = session.get(CART_KEY) or {}
+    if COUNT_KEY in cart:
+        return int(cart[COUNT_KEY]), Decimal(cart.get(SUBTOTAL_KEY) or "0")
+    # Older sessions without cached totals: derive them without persisting
+    return _compute_totals(session)
+
+
+def live_totals(session, ProductModel):
+    """
+    Returns (count, subtotal) at current product prices in one aggregate
+    query — no product rows are materialized. If that counts fewer items than
+    the session holds, some products were deleted: their ids are fetched and
+    dropped from the session (see _drop_missing).
+    """
+    qtys = {pid: qty for pid, (qty, _price) in _parsed(session).items()}
+    if not qtys:
+        return 0, Decimal("0")
+
+    cases = [When(pk=pid, then=Value(qty)) for pid, qty in qtys.items()]
+    agg = (
+        ProductModel.objects
+        .filter(id__in=qtys.keys())
+        .annotate(q=Case(*cases, output_field=IntegerField()))
+        .aggregate(
+            count=Sum("q"),
+            subtotal=Sum(
+                Coalesce("sale_price", "price") * F("q"),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+    )
+    count = agg["count"] or 0
+    if count != sum(qtys.values()):
+        existing = ProductModel.objects.filter(id__in=qtys.keys()).values_list("id", flat=True)
+        _drop_missing(session, set(existing))
+    return count, agg["subtotal"] or Decimal("0")
+
+
+def incremental_totals(session, ProductModel, changed_pid: int | None = None):
+    """
+    Returns {count, subtotal, line} for AJAX responses after a mutation.
+
+    count/subtotal are aggregated in SQL at live prices (so they match the
+    rendered cart lines); only the changed product (if any, and still in
+    the cart) is fetched to build its line.
+    """
+    count, subtotal = live_totals(session, ProductModel)
+    line = None
+    entry = _parsed(session).get(changed_pid) if changed_pid is not None else None
+    if entry:
+        product = (
+            ProductModel.objects
+            .only("id", "price", "sale_price")
+            .filter(pk=changed_pid)
+            .first()
+        )
+        if product:
+            line = _line(product, entry[0])
+    return {"count": count, "subtotal": subtotal, "line": line}
@@ -1,11 +1,8 @@
-from .cart import totals as cart_totals
-from .models import Product
+from .cart import quick_totals as cart_quick_totals
 
 def cart(request):
     try:
-        data = cart_totals(request.session, Product)
-        count = sum(li["qty"] for li in data["lines"])
-        subtotal = data["subtotal"]
+        count, subtotal = cart_quick_totals(request.session)
     except Exception:
         count, subtotal = 0, 0
     return {"cart_count": count, "cart_subtotal": subtotal}
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from shop.models import (
+    Category,
+    ProductTranslation,
+    create_translation_counterpart,
+    fill_category_counterpart,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Translate missing AR/DE category names and product translations "
+        "(fills the after-commit threads didn't finish). Safe to re-run."
+    )
+
+    def handle(self, *args, **options):
+        one_name = Q(name_de__isnull=True) | Q(name_de="") | Q(name_ar="")
+        category_ids = list(Category.objects.filter(one_name).exclude(
+            Q(name_de__isnull=True) | Q(name_de=""), name_ar=""
+        ).values_list("pk", flat=True))
+        for pk in category_ids:
+            fill_category_counterpart(pk)
+
+        # Categories whose DE name was filled before their slug was fixed up
+        reslugged = 0
+        for cat in Category.objects.exclude(one_name):
+            if cat.replace_fallback_slug():
+                cat._skip_translate = True
+                cat.save(update_fields=["slug"])
+                reslugged += 1
+
+        # One translation per product that has only DE or only AR
+        lonely = (
+            ProductTranslation.objects.filter(language__in=("de", "ar"))
+            .values("product_id")
+            .annotate(n=Count("pk"))
+            .filter(n=1)
+            .values_list("product_id", flat=True)
+        )
+        translation_ids = list(
+            ProductTranslation.objects.filter(product_id__in=lonely, language__in=("de", "ar"))
+            .values_list("pk", flat=True)
+        )
+        for pk in translation_ids:
+            create_translation_counterpart(pk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Categories filled: {len(category_ids)}, re-slugged: {reslugged}; "
+            f"product translations filled: {len(translation_ids)}"
+        ))
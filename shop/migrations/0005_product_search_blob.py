@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+def fill_search_blob(apps, schema_editor):
+    Product = apps.get_model('shop', 'Product')
+    ProductTranslation = apps.get_model('shop', 'ProductTranslation')
+
+    by_product = {}
+    for tr in ProductTranslation.objects.only('product_id', 'language', 'title', 'description'):
+        by_product.setdefault(tr.product_id, {})[tr.language] = tr
+
+    for product in Product.objects.only('pk', 'sku', 'slug'):
+        parts = [product.sku, product.slug]
+        for lang in ('de', 'ar'):
+            tr = by_product.get(product.pk, {}).get(lang)
+            if tr:
+                parts += [tr.title, tr.description]
+        blob = ' '.join(part for part in parts if part)
+        Product.objects.filter(pk=product.pk).update(search_blob=blob)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0004_alter_category_slug_alter_product_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_blob',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_blob, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-15 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0005_product_search_blob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='producttranslation',
+            index=models.Index(fields=['language', 'product'], name='shop_prodtr_lang_prod_idx'),
+        ),
+    ]
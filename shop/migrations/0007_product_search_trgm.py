@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-15 10:41
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+# pg_trgm index matching the UPPER(...) LIKE that icontains emits, so search
+# term lookups probe the index instead of scanning. Postgres-only: it is
+# created on Postgres alone and kept out of the model state, which sqlite
+# would otherwise try to rebuild it from (e.g. local test runs). Unapplying
+# drops the index but leaves the pg_trgm extension in place
+SEARCH_TRGM_INDEX = django.contrib.postgres.indexes.GinIndex(
+    django.contrib.postgres.indexes.OpClass(
+        django.db.models.functions.text.Upper('search_blob'),
+        name='gin_trgm_ops',
+    ),
+    name='shop_product_search_trgm',
+)
+
+
+def add_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.add_index(apps.get_model('shop', 'Product'), SEARCH_TRGM_INDEX)
+
+
+def remove_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('shop', 'Product'), SEARCH_TRGM_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0006_producttranslation_lang_product_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, remove_index),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.4 on 2026-10-15 12:20
+
+from django.db import migrations, models
+
+
+def fill_display_fields(apps, schema_editor):
+    Product = apps.get_model('shop', 'Product')
+    ProductTranslation = apps.get_model('shop', 'ProductTranslation')
+
+    by_product = {}
+    for tr in ProductTranslation.objects.only('product_id', 'language', 'title', 'description'):
+        by_product.setdefault(tr.product_id, {})[tr.language] = tr
+
+    for product_id, by_lang in by_product.items():
+        values = {}
+        for lang in ('de', 'ar'):
+            tr = by_lang.get(lang)
+            values[f'display_title_{lang}'] = tr.title if tr else ''
+            values[f'display_description_{lang}'] = (tr.description or '') if tr else ''
+        Product.objects.filter(pk=product_id).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0007_product_search_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='display_title_de',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='display_title_ar',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='display_description_de',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='display_description_ar',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_display_fields, migrations.RunPython.noop),
+    ]
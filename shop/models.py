@@ -1,5 +1,12 @@
 import os
-from django.db import models
+import re
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connections, models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
 from django.urls import reverse
@@ -34,12 +41,48 @@ def translate_text(text: str, target_lang: str, source_lang: str | None = None)
     t = target_lang.upper()[:2]   # 'de' -> 'DE', 'ar' -> 'AR'
     s = source_lang.upper()[:2] if source_lang else None
     try:
-        result = _deepl_translator.translate_text(text, target_lang=t, source_lang=s)
-        return str(result)
+        return _translate_cached(text, t, s)
     except Exception:
         return text
 
 
+@lru_cache(maxsize=4096)
+def _translate_cached(text: str, target_lang: str, source_lang: str | None) -> str:
+    # Failures raise and are therefore never cached
+    result = _deepl_translator.translate_text(text, target_lang=target_lang, source_lang=source_lang)
+    return str(result)
+
+
+def run_after_commit(func, *args):
+    """
+    Run func(*args) once the current transaction commits, in a daemon thread
+    so DeepL round-trips stay off the request path.
+    Set SHOP_TRANSLATE_ASYNC = False (tests/dev) to run it inline instead.
+
+    The counterpart therefore shows up shortly after the save, not on the
+    admin page that follows it. A thread dying with its worker (restart,
+    deploy) loses its fill; `manage.py backfill_translations` redoes any
+    that are missing.
+    """
+    def run():
+        try:
+            func(*args)
+        finally:
+            connections.close_all()  # this thread's connections only
+
+    def start():
+        if getattr(settings, "SHOP_TRANSLATE_ASYNC", True):
+            threading.Thread(target=run, daemon=True).start()
+        else:
+            func(*args)
+
+    transaction.on_commit(start)
+
+
+# Languages with denormalized Product.display_title_<lang> / display_description_<lang>
+DISPLAY_LANGS = ("de", "ar")
+
+
 # -------------------------
 # Slug helper (new)
 # -------------------------
@@ -55,9 +98,14 @@ def unique_slug_for(model, base: str, *, pk=None, field_name: str = "slug", max_
     if pk:
         qs = qs.exclude(pk=pk)
 
-    slug = base_slug
-    if not qs.filter(**{field_name: slug}).exists():
-        return slug
+    # One SELECT for every taken slug sharing the prefix, then pick in Python
+    prefix = base_slug[: max_length - 2]  # room for "-2" .. "-9"
+    existing = set(
+        qs.filter(**{f"{field_name}__startswith": prefix})
+        .values_list(field_name, flat=True)
+    )
+    if base_slug not in existing:
+        return base_slug
 
     # Deduplicate with -2, -3, ... while keeping length ≤ max_length
     i = 2
@@ -65,7 +113,11 @@ def unique_slug_for(model, base: str, *, pk=None, field_name: str = "slug", max_
         suffix = f"-{i}"
         allowed = max_length - len(suffix)
         slug = (base_slug[:allowed] if len(base_slug) > allowed else base_slug) + suffix
-        if not qs.filter(**{field_name: slug}).exists():
+        if slug.startswith(prefix):
+            taken = slug in existing
+        else:  # long suffix cut into the fetched prefix; check directly
+            taken = qs.filter(**{field_name: slug}).exists()
+        if not taken:
             return slug
         i += 1
 
@@ -94,18 +146,49 @@ class Category(models.Model):
         return self.name_de or self.name_ar or str(self.pk)
 
     def save(self, *args, **kwargs):
-        # keep both names filled using DeepL (both ways)
-        if self.name_ar and not self.name_de:
-            self.name_de = translate_text(self.name_ar, target_lang="de", source_lang="ar")
-        elif self.name_de and not self.name_ar:
-            self.name_ar = translate_text(self.name_de, target_lang="ar", source_lang="de")
-
-        # slug MUST be based on German name
-        if not self.slug and self.name_de:
-            self.slug = unique_slug_for(Category, self.name_de, pk=self.pk)
+        # slug MUST be based on German name; an AR-only category (DE name
+        # still being translated) gets its slug now anyway ("item", "item-2", ...)
+        # so a blank unique slug is never saved
+        if not self.slug:
+            self.slug = unique_slug_for(Category, self.name_de or self.name_ar, pk=self.pk)
 
         super().save(*args, **kwargs)
 
+        # keep both names filled using DeepL (both ways), after commit;
+        # CategoryAdmin.save_model already translated and sets _skip_translate
+        if getattr(self, "_skip_translate", False):
+            return
+        if bool(self.name_ar) != bool(self.name_de):
+            run_after_commit(fill_category_counterpart, self.pk)
+
+    def replace_fallback_slug(self) -> bool:
+        """
+        Re-slug from name_de if the slug is still the AR-name fallback given
+        while the DE name was missing ("item", "item-2", ...). Doesn't save.
+        """
+        fallback = slugify(self.name_ar or "") or "item"
+        if not self.name_de or (slugify(self.name_de) or "item") == fallback:
+            return False
+        if not re.fullmatch(rf"{re.escape(fallback)}(-\d+)?", self.slug or ""):
+            return False
+        self.slug = unique_slug_for(Category, self.name_de, pk=self.pk)
+        return True
+
+
+def fill_category_counterpart(category_id):
+    """Translate the missing AR/DE category name."""
+    cat = Category.objects.filter(pk=category_id).first()
+    if cat is None:
+        return
+    if cat.name_ar and not cat.name_de:
+        cat.name_de = translate_text(cat.name_ar, target_lang="de", source_lang="ar")
+        cat.replace_fallback_slug()
+    elif cat.name_de and not cat.name_ar:
+        cat.name_ar = translate_text(cat.name_de, target_lang="ar", source_lang="de")
+    else:
+        return
+    cat.save()
+
 
 class Product(models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="products")
@@ -116,33 +199,73 @@ class Product(models.Model):
     is_active = models.BooleanField(default=True, verbose_name=_("Active"))
     image = CloudinaryField("image", folder="products", blank=True, null=True)
     slug = models.SlugField(max_length=160,unique=True, blank=True)  # NEW
+    # Denormalized from translations on save (see refresh_denormalized):
+    # read directly by listings/detail, no translations join needed
+    display_title_de = models.CharField(max_length=255, blank=True, default="", editable=False)
+    display_title_ar = models.CharField(max_length=255, blank=True, default="", editable=False)
+    display_description_de = models.TextField(blank=True, default="", editable=False)
+    display_description_ar = models.TextField(blank=True, default="", editable=False)
+    # sku + slug + DE/AR titles & descriptions (search)
+    search_blob = models.TextField(blank=True, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = _("Product")
         verbose_name_plural = _("Products")
+        # search_blob also has a pg_trgm index on UPPER(search_blob), matching
+        # the UPPER(...) LIKE that icontains emits. Postgres-only, so it lives
+        # in migration 0007 rather than here (sqlite would rebuild it with
+        # the table)
 
     def __str__(self):
-        tr_de = self.translations.filter(language="de").first()
-        tr_ar = self.translations.filter(language="ar").first()
-        return (tr_de.title if tr_de else (tr_ar.title if tr_ar else self.sku))
+        return self.display_title_de or self.display_title_ar or self.sku
 
     def save(self, *args, **kwargs):
         """
-        Save normally; then (if slug missing) try to set slug from German title.
-        This plays nicely with admin inlines where translations save after product.
+        Save with a slug (never blank, it is unique): from the German title if
+        it exists yet, otherwise from the SKU. Admin inlines save translations
+        after the product; the DE title then replaces the SKU-based slug
+        (see set_product_slug_on_de_change). Finally sync the columns derived
+        from translations.
         """
-        new_instance = self.pk is None
+        if not self.slug:
+            title_de = (
+                self.translations.filter(language="de").values_list("title", flat=True).first()
+                if self.pk else None
+            )
+            self.slug = unique_slug_for(Product, title_de or self.sku, pk=self.pk)
         super().save(*args, **kwargs)
+        self.refresh_denormalized()
 
-        if not self.slug:
-            tr_de = self.translations.filter(language="de").first()
-            if tr_de and tr_de.title:
-                new_slug = unique_slug_for(Product, tr_de.title, pk=self.pk)
-                # update only the slug to avoid messing with timestamps
-                Product.objects.filter(pk=self.pk).update(slug=new_slug)
-                self.slug = new_slug  # keep in-memory object in sync
+    def refresh_denormalized(self):
+        """
+        Recompute the translation-derived columns (display_title_*,
+        display_description_*, search_blob) from one query
+        and persist only what changed. Uses update() so timestamps are untouched.
+        """
+        by_lang = {
+            tr.language: tr
+            for tr in ProductTranslation.objects.filter(product_id=self.pk).only(
+                "language", "title", "description"
+            )
+        }
+        values = {}
+
+        parts = [self.sku, self.slug]
+        for lang in DISPLAY_LANGS:
+            tr = by_lang.get(lang)
+            values[f"display_title_{lang}"] = tr.title if tr else ""
+            values[f"display_description_{lang}"] = (tr.description or "") if tr else ""
+            if tr:
+                parts += [tr.title, tr.description]
+        values["search_blob"] = " ".join(part for part in parts if part)
+
+        changed = {name: value for name, value in values.items() if getattr(self, name) != value}
+        if changed:
+            Product.objects.filter(pk=self.pk).update(**changed)
+            for name, value in changed.items():
+                setattr(self, name, value)  # keep in-memory object in sync
 
     def get_absolute_url(self):
         if getattr(self, "slug", None):
@@ -162,50 +285,88 @@ class ProductTranslation(models.Model):
 
     class Meta:
         unique_together = ("product", "language")
+        # unique_together already indexes (product, language); this one serves
+        # language-first lookups such as .filter(language="de") across products
+        indexes = [
+            models.Index(fields=["language", "product"], name="shop_prodtr_lang_prod_idx"),
+        ]
         verbose_name = _("Product Translation")
         verbose_name_plural = _("Product Translations")
 
     def __str__(self):
         return f"{self.title} ({self.language})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Title as loaded, so the slug signal can tell whether it changed
+        instance._orig_title = dict(zip(field_names, values)).get("title")
+        return instance
+
     def save(self, *args, **kwargs):
-        """
-        When saving AR, create DE if missing.
-        When saving DE, create AR if missing.
-        Uses DeepL to translate title & description.
-        """
-        super().save(*args, **kwargs)  # save current translation first
-
-        # Only create the counterpart if it doesn't exist
-        if self.language == "ar":
-            if not self.product.translations.filter(language="de").exists():
-                ProductTranslation.objects.create(
-                    product=self.product,
-                    language="de",
-                    title=translate_text(self.title, target_lang="de", source_lang="ar"),
-                    description=translate_text(self.description or "", target_lang="de", source_lang="ar"),
-                )
-        elif self.language == "de":
-            if not self.product.translations.filter(language="ar").exists():
-                ProductTranslation.objects.create(
-                    product=self.product,
-                    language="ar",
-                    title=translate_text(self.title, target_lang="ar", source_lang="de"),
-                    description=translate_text(self.description or "", target_lang="ar", source_lang="de"),
-                )
+        super().save(*args, **kwargs)  # post_save handlers still see the old _orig_title
+        self._orig_title = self.title
+
+
+def create_translation_counterpart(translation_id):
+    """
+    When AR exists, create DE if missing; when DE exists, create AR if missing.
+    Uses DeepL to translate title & description.
+    """
+    tr = ProductTranslation.objects.filter(pk=translation_id).first()
+    if tr is None or tr.language not in ("ar", "de"):
+        return
+    other = "de" if tr.language == "ar" else "ar"
+
+    # Only create the counterpart if it doesn't exist
+    if ProductTranslation.objects.filter(product_id=tr.product_id, language=other).exists():
+        return
+    counterpart = ProductTranslation(
+        product_id=tr.product_id,
+        language=other,
+        title=translate_text(tr.title, target_lang=other, source_lang=tr.language),
+        description=translate_text(tr.description or "", target_lang=other, source_lang=tr.language),
+    )
+    counterpart._skip_translate = True  # its source already exists; don't ping-pong
+    try:
+        counterpart.save()
+    except IntegrityError:
+        pass  # counterpart was saved meanwhile
 
 
 # -------------------------
 # Signals
 # -------------------------
+@receiver(post_save, sender=ProductTranslation)
+def queue_translation_counterpart(sender, instance, **kwargs):
+    if getattr(instance, "_skip_translate", False):
+        return
+    run_after_commit(create_translation_counterpart, instance.pk)
+
+
 @receiver(post_save, sender=ProductTranslation)
 def set_product_slug_on_de_change(sender, instance, **kwargs):
     if instance.language != "de":
         return
-    product = instance.product
-    new_slug = unique_slug_for(Product, instance.title, pk=product.pk)  # max length auto-respected
-    if product.slug != new_slug:
-        Product.objects.filter(pk=product.pk).update(slug=new_slug)
+    current_slug = Product.objects.filter(pk=instance.product_id).values_list("slug", flat=True).first()
+    # Nothing to do unless the title changed or the product has no slug yet
+    if current_slug and getattr(instance, "_orig_title", None) == instance.title:
+        return
+    new_slug = unique_slug_for(Product, instance.title, pk=instance.product_id)  # max length auto-respected
+    if current_slug != new_slug:
+        Product.objects.filter(pk=instance.product_id).update(slug=new_slug)
+        instance.product.slug = new_slug  # keep in-memory object in sync for the blob refresh
+
+
+@receiver(post_save, sender=ProductTranslation)
+@receiver(post_delete, sender=ProductTranslation)
+def refresh_product_denormalized(sender, instance, **kwargs):
+    """Keep Product's display_* columns and search_blob in sync with its translations."""
+    try:
+        product = instance.product
+    except Product.DoesNotExist:
+        return  # product itself is being deleted
+    product.refresh_denormalized()
 
 
 @receiver(post_delete, sender=Product)
@@ -216,3 +377,36 @@ def auto_delete_cloudinary_image_on_delete(sender, instance, **kwargs):
             instance.image.delete(save=False)
         except Exception:
             pass
+
+
+# -------------------------
+# Catalog cache version
+# -------------------------
+CATALOG_VERSION_KEY = "shop:catalog-version"
+
+
+def _new_catalog_version() -> int:
+    # Clock-based (ns), so a version lost to eviction is never handed out
+    # again: entries cached under older versions stay unreachable
+    return time.time_ns()
+
+
+def catalog_version() -> int:
+    """Part of every cached listing/detail key; bumped on any catalog change."""
+    return cache.get_or_set(CATALOG_VERSION_KEY, _new_catalog_version, None)
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=ProductTranslation)
+def bump_catalog_version(sender, **kwargs):
+    # Only once committed: bumping inside the (admin) transaction would let a
+    # concurrent request cache pre-commit data under the new version
+    transaction.on_commit(_incr_catalog_version)
+
+
+def _incr_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:  # key missing/evicted
+        cache.set(CATALOG_VERSION_KEY, _new_catalog_version(), None)
@@ -3,6 +3,7 @@
 // - intro / navbar
 // - ajax search
 // - category chips
+// - load more (paginated product grid)
 // - cart (live totals + soft AJAX sync)
 // - checkout (WhatsApp / Email from cart) + i18n-safe
 // - back-to-top (global scrollToTop())
@@ -12,6 +13,7 @@ document.addEventListener('DOMContentLoaded', () => {
   // Guard each init so one failure never blocks the others
   try { IntroNavbar.init(); } catch (e) { console.error('IntroNavbar.init failed:', e); }
   try { CategoryChips.init(); } catch (e) { console.error('CategoryChips.init failed:', e); }
+  try { LoadMore.init(); } catch (e) { console.error('LoadMore.init failed:', e); }
   try { Cart.init(); } catch (e) { console.error('Cart.init failed:', e); }
   try { SmoothAnchors.init(); } catch (e) { console.error('SmoothAnchors.init failed:', e); }
   try { Checkout.init(); } catch (e) { console.error('Checkout.init failed:', e); }
@@ -193,9 +195,30 @@ const SmoothAnchors = (() => {
 })();
 
 /* -----------------------------------
-   Category chips (callable after AJAX)
+   Category chips (callable after AJAX; idempotent —
+   only chips/sections not seen before get bound)
 ----------------------------------- */
 const CategoryChips = (() => {
+  let OFFSET = 0;
+  let io = null;          // one observer, rebuilt per init
+  let resizeBound = false;
+  let initialized = false;
+  const map = new Map();  // section -> chip
+
+  const anchorOf = (a) => a.dataset.anchor || a.getAttribute('href').slice(1);
+
+  const setActive = (link) => {
+    const rail = document.querySelector('.category-rail');
+    document.querySelectorAll('.category-link').forEach(l => l.classList.remove('active'));
+    if (!link || !rail) return;
+    link.classList.add('active');
+
+    // center active chip
+    const r = rail.getBoundingClientRect();
+    const b = link.getBoundingClientRect();
+    rail.scrollBy({ left: ((b.left + b.right) / 2 - (r.left + r.right) / 2), behavior: 'smooth' });
+  };
+
   const init = () => {
     const links  = [...document.querySelectorAll('.category-link')];
     const rail   = document.querySelector('.category-rail');
@@ -203,30 +226,21 @@ const CategoryChips = (() => {
     if (!links.length || !rail) return;
 
     const getOffset = () => (navbar?.offsetHeight || 56) + 8;
-    let OFFSET = getOffset();
-    window.addEventListener('resize', () => { OFFSET = getOffset(); });
+    OFFSET = getOffset();
+    if (!resizeBound) {
+      window.addEventListener('resize', () => { OFFSET = getOffset(); });
+      resizeBound = true;
+    }
 
-    const map = new Map();
+    map.clear();
     links.forEach(a => {
-      const id = a.dataset.anchor || a.getAttribute('href').slice(1);
-      const section = document.getElementById(id);
+      const section = document.getElementById(anchorOf(a));
       if (section) map.set(section, a);
-    });
-
-    const setActive = (link) => {
-      links.forEach(l => l.classList.remove('active'));
-      if (!link) return;
-      link.classList.add('active');
-
-      // center active chip
-      const r = rail.getBoundingClientRect();
-      const b = link.getBoundingClientRect();
-      rail.scrollBy({ left: ((b.left + b.right) / 2 - (r.left + r.right) / 2), behavior: 'smooth' });
-    };
 
-    links.forEach(a => {
+      if (a.dataset.chipBound) return;
+      a.dataset.chipBound = '1';
       a.addEventListener('click', e => {
-        const id = a.dataset.anchor || a.getAttribute('href').slice(1);
+        const id = anchorOf(a);
         const target = document.getElementById(id);
         if (!target) return;
         e.preventDefault();
@@ -237,7 +251,8 @@ const CategoryChips = (() => {
       });
     });
 
-    const io = new IntersectionObserver(entries => {
+    io?.disconnect();
+    io = new IntersectionObserver(entries => {
       const vis = entries.filter(e => e.isIntersecting)
                          .sort((a,b)=> b.intersectionRatio - a.intersectionRatio)[0];
       if (vis) setActive(map.get(vis.target));
@@ -245,14 +260,85 @@ const CategoryChips = (() => {
 
     map.forEach((_, section) => io.observe(section));
 
+    // Pick the chip from the URL hash once; later runs (load more) keep the current one
+    if (initialized) return;
+    initialized = true;
     const initId   = (location.hash || '').slice(1);
-    const initLink = links.find(l => (l.dataset.anchor || l.getAttribute('href').slice(1)) === initId) || links[0];
+    const initLink = links.find(l => anchorOf(l) === initId) || links[0];
     if (initLink) setActive(initLink);
   };
 
   return { init };
 })();
 
+/* -----------------------------------
+   Load more — append the next page of sections
+   (a category continuing from the previous page is merged)
+----------------------------------- */
+const LoadMore = (() => {
+  const addChip = (h2) => {
+    const rail = document.querySelector('.category-rail');
+    if (!rail || rail.querySelector(`[data-anchor="${h2.id}"]`)) return;
+    const li = document.createElement('li');
+    li.className = 'nav-item';
+    const a = document.createElement('a');
+    a.className = 'nav-link category-link';
+    a.href = `#${h2.id}`;
+    a.dataset.anchor = h2.id;
+    a.textContent = h2.textContent.trim();
+    li.appendChild(a);
+    rail.appendChild(li);
+  };
+
+  const append = (results, html) => {
+    const tpl = document.createElement('template');
+    tpl.innerHTML = html;
+    const frag = tpl.content;
+
+    frag.querySelectorAll('h2[id]').forEach(h2 => {
+      const existing = document.getElementById(h2.id);
+      const newRow = h2.nextElementSibling;
+      if (existing && newRow) {
+        // same category as the end of the previous page: move cards over
+        const row = existing.nextElementSibling;
+        [...newRow.children].forEach(col => row.appendChild(col));
+        h2.remove();
+        newRow.remove();
+      } else {
+        addChip(h2);
+      }
+    });
+    results.appendChild(frag);
+  };
+
+  const onClick = async (e) => {
+    const btn = e.target.closest('.js-load-more');
+    if (!btn || !btn.dataset.url) return;
+    const results = document.getElementById('shop-results');
+    if (!results) return;
+    e.preventDefault();
+
+    const wrap = btn.closest('.load-more-wrap');
+    btn.classList.add('disabled');
+    try {
+      const resp = await fetch(btn.dataset.url, { headers: { 'X-Requested-With': 'XMLHttpRequest' } });
+      if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+      const html = await resp.text();
+      wrap?.remove(); // the fragment brings its own button if more pages remain
+      append(results, html);
+      CategoryChips.init(); // re-bind chips incl. new categories
+    } catch (err) {
+      console.error(err);
+      btn.classList.remove('disabled');
+    }
+  };
+
+  // Delegated, so it keeps working after AJAX search swaps the results
+  const init = () => { document.addEventListener('click', onClick); };
+
+  return { init };
+})();
+
 /* -----------------------------------
    CART — live totals + soft AJAX sync
 ----------------------------------- */
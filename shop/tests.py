@@ -1,3 +1,339 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .cart import quick_totals
+from .models import (
+    CATALOG_VERSION_KEY,
+    Category,
+    Product,
+    ProductTranslation,
+    catalog_version,
+    fill_category_counterpart,
+    unique_slug_for,
+)
+
+# Runs against Postgres (DATABASE_URL) or, without one, sqlite:
+#   SECRET_KEY=test DATABASE_URL=sqlite:///test.sqlite3 python manage.py test shop
+# (the pg_trgm search index is only created on Postgres)
+
+AJAX = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
+
+# Plain HTTP test client: no redirect to https (on by default when DEBUG is off),
+# per-test in-memory cache (never a shared Redis from the environment)
+# and plain static storage (the manifest only exists after collectstatic)
+TEST_SETTINGS = dict(
+    SECURE_SSL_REDIRECT=False,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    STORAGES={
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+)
+
+
+def make_product(category, sku, price="10.00", sale_price=None, title_de=None, **kwargs):
+    product = Product.objects.create(
+        category=category, sku=sku, price=price, sale_price=sale_price, **kwargs
+    )
+    if title_de:
+        ProductTranslation.objects.create(
+            product=product, language="de", title=title_de, description="<p>Beschreibung</p>"
+        )
+    return product
+
+
+class UniqueSlugTests(TestCase):
+    def test_suffixes_taken_slugs(self):
+        Category.objects.create(name_de="Obst", name_ar="فاكهة")
+        Category.objects.create(name_de="Obst!", name_ar="فاكهة")
+        self.assertEqual(unique_slug_for(Category, "Obst"), "obst-3")
+
+    def test_own_slug_is_not_taken(self):
+        cat = Category.objects.create(name_de="Obst", name_ar="فاكهة")
+        self.assertEqual(unique_slug_for(Category, "Obst", pk=cat.pk), "obst")
+
+    def test_respects_max_length(self):
+        base = "a" * 200
+        first = unique_slug_for(Category, base)
+        self.assertEqual(first, "a" * 160)
+        Category.objects.create(name_de="x", name_ar="x", slug=first)
+        self.assertEqual(unique_slug_for(Category, base), "a" * 158 + "-2")
+
+    def test_blank_base_falls_back_to_item(self):
+        self.assertEqual(unique_slug_for(Category, "فاكهة"), "item")
+
+
+class SlugOnSaveTests(TestCase):
+    def setUp(self):
+        self.cat = Category.objects.create(name_de="Obst", name_ar="فاكهة")
+
+    def test_product_without_translations_gets_sku_slug(self):
+        product = make_product(self.cat, "SKU-1")
+        self.assertEqual(product.slug, "sku-1")
+
+    def test_de_title_replaces_sku_slug(self):
+        product = make_product(self.cat, "SKU-1", title_de="Roter Apfel")
+        product.refresh_from_db()
+        self.assertEqual(product.slug, "roter-apfel")
+
+    def test_ar_only_products_do_not_collide(self):
+        # DE counterparts are only translated after commit
+        first = make_product(self.cat, "SKU-1")
+        ProductTranslation.objects.create(product=first, language="ar", title="تفاح")
+        second = make_product(self.cat, "SKU-2")
+        first.refresh_from_db()
+        self.assertTrue(first.slug)
+        self.assertNotEqual(first.slug, second.slug)
+
+    def test_ar_only_categories_do_not_collide(self):
+        first = Category.objects.create(name_ar="فاكهة")
+        second = Category.objects.create(name_ar="خضار")
+        self.assertEqual((first.slug, second.slug), ("item", "item-2"))
+
+    @mock.patch("shop.models.translate_text", return_value="Obst")
+    def test_translated_de_name_replaces_fallback_slug(self, _):
+        Category.objects.create(name_ar="خضار")
+        cat = Category.objects.create(name_ar="فاكهة")
+        self.assertEqual(cat.slug, "item-2")
+        fill_category_counterpart(cat.pk)
+        cat.refresh_from_db()
+        self.assertEqual((cat.name_de, cat.slug), ("Obst", "obst-2"))
+
+
+class DenormalizedFieldsTests(TestCase):
+    def setUp(self):
+        self.cat = Category.objects.create(name_de="Obst", name_ar="فاكهة")
+        self.product = make_product(self.cat, "SKU-1")
+
+    def test_translation_save_refreshes_columns(self):
+        ProductTranslation.objects.create(
+            product=self.product, language="ar", title="تفاح", description="حلو"
+        )
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.display_title_ar, "تفاح")
+        self.assertEqual(self.product.display_description_ar, "حلو")
+        self.assertIn("تفاح", self.product.search_blob)
+        self.assertIn("SKU-1", self.product.search_blob)
+        self.assertEqual(str(self.product), "تفاح")
+
+    def test_translation_edit_and_delete_refresh_columns(self):
+        tr = ProductTranslation.objects.create(product=self.product, language="de", title="Apfel")
+        tr.title = "Birne"
+        tr.save()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.display_title_de, "Birne")
+        self.assertNotIn("Apfel", self.product.search_blob)
+
+        tr.delete()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.display_title_de, "")
+        self.assertNotIn("Birne", self.product.search_blob)
+        self.assertEqual(str(self.product), "SKU-1")
+
+
+@override_settings(**TEST_SETTINGS)
+class CartTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        cat = Category.objects.create(name_de="Obst", name_ar="فاكهة")
+        self.apple = make_product(cat, "SKU-1", price="10.00", title_de="Apfel")
+        self.pear = make_product(cat, "SKU-2", price="10.00", sale_price="8.50", title_de="Birne")
+
+    def add(self, product, qty):
+        return self.client.post(reverse("shop:cart_add"), {"product_id": product.pk, "qty": qty}, **AJAX)
+
+    def test_ajax_totals(self):
+        self.assertEqual(self.add(self.apple, 2).json()["count"], 2)
+        data = self.add(self.pear, 3).json()
+        self.assertEqual((data["count"], data["subtotal"]), (5, "45.50"))
+
+        data = self.client.post(
+            reverse("shop:cart_update"), {"product_id": self.pear.pk, "qty": 1}, **AJAX
+        ).json()
+        self.assertEqual((data["count"], data["subtotal"]), (3, "28.50"))
+        self.assertEqual((data["unit_price"], data["line_total"]), ("8.50", "8.50"))
+
+        data = self.client.post(reverse("shop:cart_remove"), {"product_id": self.apple.pk}, **AJAX).json()
+        self.assertEqual((data["count"], data["subtotal"]), (1, "8.50"))
+        self.assertEqual(quick_totals(self.client.session)[0], 1)
+
+    def test_cart_page_totals(self):
+        self.add(self.apple, 2)
+        self.add(self.pear, 1)
+        response = self.client.get(reverse("shop:cart"))
+        self.assertEqual(len(response.context["lines"]), 2)
+        self.assertEqual(str(response.context["subtotal"]), "28.50")
+        self.assertEqual(response.context["cart_count"], 3)
+
+    def test_deleted_product_is_dropped_from_cart(self):
+        self.add(self.apple, 3)
+        self.add(self.pear, 2)
+        self.apple.delete()
+
+        response = self.client.get(reverse("shop:cart"))
+        self.assertEqual(len(response.context["lines"]), 1)
+        self.assertEqual(response.context["cart_count"], 2)
+
+        data = self.client.post(reverse("shop:cart_remove"), {"product_id": self.pear.pk}, **AJAX).json()
+        self.assertEqual(data["count"], 0)
+        self.assertEqual(quick_totals(self.client.session)[0], 0)
+
+    def test_deleted_product_is_dropped_by_ajax_totals(self):
+        self.add(self.apple, 3)
+        self.apple.delete()
+        self.assertEqual(self.add(self.pear, 1).json()["count"], 1)
+        self.assertEqual(quick_totals(self.client.session)[0], 1)
+
+    def test_inactive_product_cannot_be_added(self):
+        self.pear.is_active = False
+        self.pear.save()
+        self.assertEqual(self.add(self.pear, 1).status_code, 400)
+
+
+@override_settings(**TEST_SETTINGS)
+class ListingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cat = Category.objects.create(name_de="Obst", name_ar="فاكهة")
+        self.apple = make_product(self.cat, "SKU-1", title_de="Roter Apfel")
+        self.pear = make_product(self.cat, "SKU-2", title_de="Birne")
+
+    def listed_ids(self, response):
+        return {p.pk for s in response.context["sections"] for p in s["products"]}
+
+    def test_search_matches_every_term(self):
+        response = self.client.get(reverse("shop:home"), {"q": "apfel rot"})
+        self.assertEqual(self.listed_ids(response), {self.apple.pk})
+        response = self.client.get(reverse("shop:home"), {"q": "sku-2"})
+        self.assertEqual(self.listed_ids(response), {self.pear.pk})
+
+    def test_inactive_products_are_hidden(self):
+        self.pear.is_active = False
+        self.pear.save()
+        self.assertEqual(self.listed_ids(self.client.get(reverse("shop:home"))), {self.apple.pk})
+        response = self.client.get(reverse("shop:product_detail", kwargs={"slug": self.pear.slug}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_pagination(self):
+        response = self.client.get(reverse("shop:home"), {"page_size": 1})
+        self.assertEqual(len(self.listed_ids(response)), 1)
+        self.assertIn("next_page_url", response.context)
+        response = self.client.get(reverse("shop:products_page", kwargs={"page": 2}), {"page_size": 1})
+        self.assertEqual(len(self.listed_ids(response)), 1)
+        self.assertNotIn("next_page_url", response.context)
+
+
+@override_settings(**TEST_SETTINGS)
+class QueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cats = [
+            Category.objects.create(name_de=f"Kategorie {i}", name_ar=f"فئة {i}") for i in range(3)
+        ]
+        self.products = [self.make(i) for i in range(3)]
+
+    def make(self, i):
+        return make_product(self.cats[i % 3], f"SKU-{i}", title_de=f"Produkt {i}")
+
+    def count_queries(self, url, **params):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(url, params).status_code, 200)
+        return len(ctx)
+
+    def test_listing(self):
+        # page count + one page of products (category names joined)
+        self.assertEqual(self.count_queries(reverse("shop:home")), 2)
+        self.products += [self.make(i) for i in range(3, 20)]
+        self.assertEqual(self.count_queries(reverse("shop:home")), 2)
+        self.assertEqual(self.count_queries(reverse("shop:home"), q="produkt"), 2)
+
+    def test_detail(self):
+        url = reverse("shop:product_detail", kwargs={"slug": self.products[0].slug})
+        self.assertEqual(self.count_queries(url), 1)
+
+    def test_cart_page_does_not_query_per_line(self):
+        url = reverse("shop:cart")
+        self.client.post(reverse("shop:cart_add"), {"product_id": self.products[0].pk}, **AJAX)
+        one_line = self.count_queries(url)
+        for product in self.products[1:]:
+            self.client.post(reverse("shop:cart_add"), {"product_id": product.pk}, **AJAX)
+        # titles are denormalized onto Product: no translations query at all
+        self.assertEqual(one_line, 2)  # session + cart products
+        self.assertEqual(self.count_queries(url), one_line)
+
+
+@override_settings(**TEST_SETTINGS, SHOP_VIEW_CACHE=True)
+class ViewCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        cat = Category.objects.create(name_de="Obst", name_ar="فاكهة")
+        self.apple = make_product(cat, "SKU-1", title_de="Apfel")
+
+    def test_listing_is_cached(self):
+        url = reverse("shop:home")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        # garbage / out-of-range ?page= values share page 1's entry
+        with self.assertNumQueries(0):
+            self.client.get(url, {"page": "abc"})
+        self.client.get(url, {"page": 99})
+        with self.assertNumQueries(2):
+            self.client.get(url, {"page": 99})
+
+    def test_search_is_not_cached(self):
+        url = reverse("shop:ajax_search")
+        self.client.get(url, {"q": "apfel"})
+        with self.assertNumQueries(2):
+            self.client.get(url, {"q": "apfel"})
+
+    def test_detail_is_cached(self):
+        url = reverse("shop:product_detail", kwargs={"slug": self.apple.slug})
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    def test_catalog_change_invalidates_after_commit(self):
+        url = reverse("shop:product_detail", kwargs={"slug": self.apple.slug})
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.apple.price = "12.50"
+            self.apple.save()
+        self.assertContains(self.client.get(url), "12,50")
+
+    def test_evicted_version_is_not_reused(self):
+        version = catalog_version()
+        cache.delete(CATALOG_VERSION_KEY)
+        self.assertGreater(catalog_version(), version)
+
+    @override_settings(SHOP_VIEW_CACHE=False)
+    def test_off_without_shared_cache(self):
+        url = reverse("shop:home")
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+
+@mock.patch("shop.models.translate_text", side_effect=lambda text, **kw: f"{text}-{kw['target_lang']}")
+class BackfillTranslationsTests(TestCase):
+    def test_fills_missing_counterparts_once(self, _):
+        # after-commit fills never run here: as if their threads were lost
+        cat = Category.objects.create(name_ar="فاكهة")
+        product = make_product(cat, "SKU-1", title_de="Apfel")
+        for _run in range(2):
+            call_command("backfill_translations", stdout=StringIO())
+        cat.refresh_from_db()
+        self.assertEqual(cat.name_de, "فاكهة-de")
+        self.assertEqual(
+            list(product.translations.order_by("language").values_list("language", "title")),
+            [("ar", "Apfel-ar"), ("de", "Apfel")],
+        )
@@ -7,6 +7,7 @@ urlpatterns = [
     path("p/<slug:slug>/", views.product_detail, name="product_detail"),
     path("p/id/<int:pk>/", views.product_detail, name="product_detail_by_id"),
     path("ajax/search/", views.ajax_search, name="ajax_search"),
+    path("products/page/<int:page>/", views.products_page, name="products_page"),
     path("cart/", views.cart_detail, name="cart"),
     path("cart/add/", views.cart_add_view, name="cart_add"),
     path("cart/update/", views.cart_update_qty_view, name="cart_update"),
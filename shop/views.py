@@ -1,23 +1,31 @@
 # shop/views.py
 from __future__ import annotations
 
-import re
+import hashlib
 from decimal import Decimal
-
-from django.db.models import Q, Prefetch
+from itertools import groupby
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Lower, NullIf
 from django.http import JsonResponse, HttpResponseBadRequest
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse
+from django.utils.http import urlencode
 from django.views.decorators.http import require_GET, require_POST
 from django.utils.translation import get_language, gettext as _
 
-from .models import Product, ProductTranslation
+from .models import DISPLAY_LANGS, Product, catalog_version
 from .cart import (
     add as cart_add,
     set_qty as cart_set_qty,
     remove as cart_remove,
     clear as cart_clear,
     totals as cart_totals,
+    incremental_totals as cart_incremental_totals,
 )
 
 # ---------------------------------------------------------
@@ -29,71 +37,85 @@ def _short_lang(default: str = "de") -> str:
     return (get_language() or default).lower().split("-")[0]
 
 
-def _prefetch(qs):
-    """Prefetch category and all translations into p.tr_list."""
-    return qs.select_related("category").prefetch_related(
-        Prefetch(
-            "translations",
-            queryset=ProductTranslation.objects.all(),
-            to_attr="tr_list",
-        )
-    )
+def _ui_short(request) -> str:
+    """_short_lang() computed once per request and kept on request.ui_short."""
+    ui_short = getattr(request, "ui_short", None)
+    if ui_short is None:
+        ui_short = request.ui_short = _short_lang()
+    return ui_short
+
+
+# Columns product cards actually render (+ sku for the title fallback) and
+# the category names for section labels
+_LIST_FIELDS = (
+    "id", "sku", "price", "sale_price", "slug", "image",
+    "display_title_de", "display_title_ar",
+    "category", "category__name_de", "category__name_ar",
+)
+
+
+def _display_qs(qs, *, full: bool = False):
+    """
+    Join the category; titles/descriptions are denormalized onto Product
+    (display_title_<lang> / display_description_<lang>), so no translations
+    query is needed. List views (full=False) load only the columns cards
+    need; the detail page passes full=True.
+    """
+    qs = qs.defer("search_blob") if full else qs.only(*_LIST_FIELDS)
+    return qs.select_related("category")
 
 
 def _cat_display_title(cat, ui_short: str) -> str:
     """Pick category label in the UI language."""
     if not cat:
         return _("Sonstiges")
-    name_de = getattr(cat, "name_de", None)
-    name_ar = getattr(cat, "name_ar", None)
-    generic = getattr(cat, "name", None) or getattr(cat, "title", None) or str(cat)
-    # Arabic UI prefers AR, fallback DE; German UI prefers DE, fallback generic/AR
-    return (name_ar or name_de or generic) if ui_short == "ar" else (name_de or generic or name_ar)
+    # Arabic UI prefers AR; otherwise str(cat): DE, then AR, then pk
+    if ui_short == "ar" and cat.name_ar:
+        return cat.name_ar
+    return str(cat)
 
 
-def _pick_translation(tr_list, ui_short: str, default_short: str = "de"):
-    """Choose the best translation object from a list."""
-    if not tr_list:
-        return None
-    preferred = ["ar", default_short] if ui_short == "ar" else [ui_short, default_short]
-
-    def code_of(t):
-        code = (getattr(t, "language_code", None) or getattr(t, "language", "")).lower()
-        return code.split("-")[0]
-
-    for want in preferred:
-        for t in tr_list:
-            if code_of(t) == want:
-                return t
-    return tr_list[0]
+def _pick_lang(p: Product, ui_short: str, default_short: str = "de") -> str | None:
+    """
+    Choose the language to display: UI language, then the default language,
+    then whichever has a title.
+    """
+    for lang in dict.fromkeys((ui_short, default_short, *DISPLAY_LANGS)):
+        if lang in DISPLAY_LANGS and getattr(p, f"display_title_{lang}"):
+            return lang
+    return None
 
 
-def _decorate_product(p: Product, ui_short: str, default_lang: str = "de") -> Product:
+def _decorate_product(
+    p: Product,
+    ui_short: str,
+    default_lang: str = "de",
+    *,
+    with_description: bool = True,
+    category_label: str | None = None,
+) -> Product:
     """
     Attach display fields to a Product instance:
 
       - p.display_title
-      - p.display_description
-      - p.category_display_title
+      - p.display_description (empty when with_description=False, i.e. the
+        description column was not fetched)
+      - p.category_display_title (category_label if the caller already has it)
 
-    This is resilient even if no prefetch was used (it will fall back to
-    querying p.translations for cart-sized lists).
+    Reads the denormalized display_title_<lang> / display_description_<lang>
+    columns; title and description come from the same language.
     """
-    # Prefer prefetched list; otherwise fall back to an on-demand fetch (cart is small)
-    tr_list = getattr(p, "tr_list", None)
-    if tr_list is None:
-        try:
-            tr_list = list(p.translations.all())
-        except Exception:
-            tr_list = []
-
-    tr = _pick_translation(tr_list, ui_short, default_lang)
-    raw_title = getattr(p, "slug", None) or str(p)  # a safe fallback
+    lang = _pick_lang(p, ui_short, default_lang)
+    raw_title = p.slug or p.sku  # a safe fallback
     raw_desc = ""
 
-    p.display_title = (getattr(tr, "title", None) or raw_title) if tr else raw_title
-    p.display_description = (getattr(tr, "description", None) or raw_desc) if tr else raw_desc
-    p.category_display_title = _cat_display_title(getattr(p, "category", None), ui_short)
+    p.display_title = getattr(p, f"display_title_{lang}") if lang else raw_title
+    p.display_description = (
+        getattr(p, f"display_description_{lang}") or raw_desc if lang and with_description else raw_desc
+    )
+    if category_label is None:
+        category_label = _cat_display_title(p.category, ui_short)
+    p.category_display_title = category_label
     return p
 
 
@@ -103,33 +125,25 @@ def _decorate_product(p: Product, ui_short: str, default_lang: str = "de") -> Pr
 
 def _language_agnostic_filter(qs, q: str):
     """
-    Filter by words across:
+    Filter by words across Product.search_blob, which holds:
       - translations.title / translations.description
       - product.slug
       - product.sku
+
+    Every term must match; no join on translations, so no DISTINCT either.
     """
     q = (q or "").strip()
     if not q:
         return qs
 
-    terms = [t for t in re.split(r"\s+", q) if t]
+    terms = q.split()  # collapses whitespace runs, no empties
     if not terms:
         return qs
 
-    SEARCH_FIELDS = (
-        "translations__title__icontains",
-        "translations__description__icontains",
-        "slug__icontains",
-        "sku__icontains",
-    )
-
     for term in terms:
-        term_q = Q()
-        for f in SEARCH_FIELDS:
-            term_q |= Q(**{f: term})
-        qs = qs.filter(term_q)
+        qs = qs.filter(search_blob__icontains=term)
 
-    return qs.distinct()
+    return qs
 
 
 def _build_anchor(cat) -> str:
@@ -137,31 +151,120 @@ def _build_anchor(cat) -> str:
     return f"cat-{cat.pk}" if cat else "cat-misc"
 
 
-def _build_sections(request, q: str = ""):
+def _cat_label_ordering(ui_short: str):
+    """SQL mirror of _cat_display_title: localized name, falling back to the other one."""
+    first, second = ("name_ar", "name_de") if ui_short == "ar" else ("name_de", "name_ar")
+    return Lower(Coalesce(NullIf(f"category__{first}", Value("")), f"category__{second}"))
+
+
+PAGE_SIZE = 40       # products per page / "load more" batch
+MAX_PAGE_SIZE = 100  # upper bound for ?page_size=
+
+
+def _page_size(request) -> int:
+    try:
+        size = int(request.GET.get("page_size") or PAGE_SIZE)
+    except ValueError:
+        size = PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _page_number(page) -> int:
+    """?page= / URL page as a positive int (1 when missing or garbage)."""
+    try:
+        return max(1, int(page))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _build_sections(request, q: str = "", page=1, page_size: int = PAGE_SIZE):
     """
     Single source of truth:
-      - fetch products
+      - fetch one page of active products, already ordered by category label
       - apply language-agnostic search
-      - prefetch translations
       - decorate display fields for the current UI lang
-      - group by category with stable anchors
+      - group consecutive products by category with stable anchors
+
+    Returns (sections, page_obj). A category may continue on the next page;
+    it then reuses the same anchor and the frontend merges it.
     """
-    ui_short = _short_lang()
-    qs = Product.objects.all().order_by("-id")
+    ui_short = _ui_short(request)
+    qs = Product.objects.filter(is_active=True)  # inactive ones can't be added to the cart
+    qs = qs.order_by(_cat_label_ordering(ui_short), "category_id", "-id")
     qs = _language_agnostic_filter(qs, q)
-    qs = _prefetch(qs)
+    qs = _display_qs(qs)
+    page_obj = Paginator(qs, page_size).get_page(page)
+
+    sections = []
+    # At most page_size rows; no need to stream them through a server-side cursor
+    for _cat_id, items in groupby(page_obj.object_list, key=attrgetter("category_id")):
+        items = list(items)
+        cat = items[0].category
+        label = _cat_display_title(cat, ui_short)  # once per category, not per product
+        products = [
+            _decorate_product(p, ui_short, with_description=False, category_label=label)
+            for p in items
+        ]
+        sections.append({"anchor": _build_anchor(cat), "label": label, "products": products})
+    return sections, page_obj
+
+
+CACHE_TIMEOUT = 60 * 5
 
-    grouped = {}
-    for p in qs:
-        _decorate_product(p, ui_short)
-        cat = getattr(p, "category", None)
-        anchor = _build_anchor(cat)
-        label = p.category_display_title
-        bucket = grouped.setdefault(anchor, {"anchor": anchor, "label": label, "products": []})
-        bucket["products"].append(p)
 
-    sections = sorted(grouped.values(), key=lambda s: s["label"].lower())
-    return sections
+def _view_cache_key(*parts) -> str | None:
+    """
+    Cache key for view data: `parts` + the catalog version, so any
+    product/category/translation change invalidates every entry.
+    None when settings.SHOP_VIEW_CACHE is off (no shared in-memory cache).
+    """
+    if not settings.SHOP_VIEW_CACHE:
+        return None
+    raw = ":".join(str(p) for p in (catalog_version(), *parts))
+    return "shop:view:" + hashlib.md5(raw.encode()).hexdigest()
+
+
+def _cached(*parts, build):
+    """
+    cache.get_or_set() for view data under _view_cache_key(*parts); just
+    build() when view caching is off.
+    Caches data, not HTML: pages carry per-user CSRF tokens and cart counts.
+    """
+    key = _view_cache_key(*parts)
+    if key is None:
+        return build()
+    return cache.get_or_set(key, build, CACHE_TIMEOUT)
+
+
+def _listing_context(request, q: str, page=1) -> dict:
+    """Template context for a page of sections, incl. the "load more" URLs."""
+    ui_short = _ui_short(request)
+    page_size = _page_size(request)
+    page = _page_number(page)
+
+    # Search results are not cached: arbitrary ?q= means unbounded keys and
+    # a cache write per keystroke of the live search
+    key = None if q else _view_cache_key("list", ui_short, page, page_size)
+    data = cache.get(key) if key else None
+    if data is None:
+        sections, page_obj = _build_sections(request, q, page, page_size)
+        data = sections, (page_obj.next_page_number() if page_obj.has_next() else None)
+        if key:
+            # Under the page actually served: an out-of-range ?page= gets the
+            # last page and must not mint a key of its own
+            key = _view_cache_key("list", ui_short, page_obj.number, page_size)
+            cache.set(key, data, CACHE_TIMEOUT)
+    sections, next_page = data
+    ctx = {"sections": sections, "q": q, "is_search": bool(q)}
+    if next_page:
+        params = {"q": q} if q else {}
+        if page_size != PAGE_SIZE:
+            params["page_size"] = page_size
+        suffix = f"?{urlencode(params)}" if params else ""
+        # JS fetches the fragment; the href is the no-JS fallback
+        ctx["next_page_url"] = reverse("shop:products_page", kwargs={"page": next_page}) + suffix
+        ctx["next_page_href"] = reverse("shop:home") + "?" + urlencode({**params, "page": next_page})
+    return ctx
 
 
 # ---------------------------------------------------------
@@ -179,25 +282,22 @@ def _fmt_display(val: Decimal | float | int) -> str:
     return f"{_fmt2(val)} €"
 
 
-def _find_line(lines, product_id: int):
-    for li in lines:
-        if getattr(li.get("product"), "id", None) == product_id:
-            return li
-    return None
-
-
 # =========================================================
 # CART
 # =========================================================
 
 def cart_detail(request):
-    ui_short = _short_lang()
+    ui_short = _ui_short(request)
     data = cart_totals(request.session, Product)
     # Ensure product.display_title exists for templates (works with/without prefetch)
+    label_cache = {}
     for li in data["lines"]:
         prod = li.get("product")
         if prod:
-            _decorate_product(prod, ui_short)
+            key = (prod.category_id, ui_short)
+            if key not in label_cache:
+                label_cache[key] = _cat_display_title(prod.category, ui_short)
+            _decorate_product(prod, ui_short, with_description=False, category_label=label_cache[key])
     return render(
         request,
         "shop/cart.html",
@@ -210,7 +310,12 @@ def cart_add_view(request):
     pid = request.POST.get("product_id")
     qty = request.POST.get("qty") or "1"
     try:
-        product = Product.objects.get(pk=int(pid))
+        # Only what pricing needs; inactive products can't be added
+        product = (
+            Product.objects
+            .only("id", "price", "sale_price", "is_active", "stock")
+            .get(pk=int(pid), is_active=True)
+        )
         qty_int = max(1, int(qty))
     except Exception:
         return HttpResponseBadRequest(_("Ungültige Produkt-/Mengenangabe."))
@@ -219,12 +324,11 @@ def cart_add_view(request):
     cart_add(request.session, product.id, qty_int, price)
 
     if request.headers.get("x-requested-with") == "XMLHttpRequest":
-        data = cart_totals(request.session, Product)
-        count = sum(li["qty"] for li in data["lines"])
+        data = cart_incremental_totals(request.session, Product)
         return JsonResponse(
             {
                 "ok": True,
-                "count": count,
+                "count": data["count"],
                 "subtotal": _fmt2(data["subtotal"]),
                 "subtotal_display": _fmt_display(data["subtotal"]),
                 "cart_url": reverse("shop:cart"),
@@ -246,16 +350,15 @@ def cart_update_qty_view(request):
         return HttpResponseBadRequest(_("Ungültige Aktualisierung."))
 
     if request.headers.get("x-requested-with") == "XMLHttpRequest":
-        data = cart_totals(request.session, Product)
-        line = _find_line(data["lines"], pid_i) or {}
+        data = cart_incremental_totals(request.session, Product, pid_i)
+        line = data["line"] or {}
         unit = line.get("unit_price", Decimal("0"))
         line_total = line.get("line_total", Decimal("0"))
-        count = sum(li["qty"] for li in data["lines"])
 
         return JsonResponse(
             {
                 "ok": True,
-                "count": count,
+                "count": data["count"],
                 "unit_price": _fmt2(unit),
                 "unit_price_display": _fmt_display(unit),
                 "line_total": _fmt2(line_total),
@@ -277,11 +380,11 @@ def cart_remove_view(request):
         pass
 
     if request.headers.get("x-requested-with") == "XMLHttpRequest":
-        data = cart_totals(request.session, Product)
+        data = cart_incremental_totals(request.session, Product)
         return JsonResponse(
             {
                 "ok": True,
-                "count": sum(li["qty"] for li in data["lines"]),
+                "count": data["count"],
                 "subtotal": _fmt2(data["subtotal"]),
                 "subtotal_display": _fmt_display(data["subtotal"]),
             }
@@ -303,18 +406,12 @@ def cart_clear_view(request):
 
 @require_GET
 def index(request):
-    """Home page: category-ordered product grid with optional search (?q=...)."""
+    """
+    Home page: category-ordered product grid with optional search (?q=...),
+    paginated via ?page=N (&page_size=M).
+    """
     q = (request.GET.get("q") or "").strip()
-    sections = _build_sections(request, q)
-    return render(
-        request,
-        "shop/index.html",
-        {
-            "sections": sections,
-            "q": q,
-            "is_search": bool(q),
-        },
-    )
+    return render(request, "shop/index.html", _listing_context(request, q, request.GET.get("page")))
 
 
 @require_GET
@@ -324,21 +421,28 @@ def ajax_search(request):
     Keeps the page static (no reload) while updating results + URL (?q=...).
     """
     q = (request.GET.get("q") or "").strip()
-    sections = _build_sections(request, q)
-    return render(
-        request,
-        "shop/partials/sections.html",
-        {"sections": sections, "q": q, "is_search": bool(q)},
-    )
+    return render(request, "shop/partials/sections.html", _listing_context(request, q))
+
+
+@require_GET
+def products_page(request, page):
+    """
+    AJAX "load more" endpoint: the sections HTML fragment for page N
+    (same ?q= / ?page_size= as the listing it continues).
+    """
+    q = (request.GET.get("q") or "").strip()
+    return render(request, "shop/partials/sections.html", _listing_context(request, q, page))
 
 
 def product_detail(request, slug=None, pk=None):
-    """Localized product detail page (titles/descriptions via ProductTranslation)."""
-    ui_short = _short_lang()
+    """Localized product detail page (titles/descriptions denormalized from ProductTranslation)."""
+    ui_short = _ui_short(request)
     lookup = {"slug": slug} if slug else {"pk": pk}
 
-    base_qs = _prefetch(Product.objects.all())
-    product = get_object_or_404(base_qs, **lookup)
-    _decorate_product(product, ui_short)
+    def build():
+        base_qs = _display_qs(Product.objects.filter(is_active=True), full=True)
+        return _decorate_product(get_object_or_404(base_qs, **lookup), ui_short)
+
+    product = _cached("detail", ui_short, *lookup.items(), build=build)
 
     return render(request, "shop/product_detail.html", {"product": product})
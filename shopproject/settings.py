@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
 
     "cloudinary",
     "cloudinary_storage",
@@ -98,11 +99,50 @@ WSGI_APPLICATION = "shopproject.wsgi.application"
 DATABASES = {
     "default": dj_database_url.config(
         default=os.environ.get("DATABASE_URL"),
-        conn_max_age=600,
-        ssl_require=True,
+        conn_max_age=600,         # persistent connections per worker
+        conn_health_checks=True,  # ping reused connections instead of failing on stale ones
+        # sqlite (local test runs: DATABASE_URL=sqlite:///db.sqlite3) has no sslmode
+        ssl_require=not os.environ.get("DATABASE_URL", "").startswith("sqlite"),
     )
 }
 
+# Connection pooling (both opt-in via env):
+# - DB_CONN_POOL=true: SQLAlchemy-backed pool inside each worker
+#   (django-db-connection-pool); connections go back to the pool per request
+# - PGBOUNCER=true: DATABASE_URL points at pgbouncer in transaction mode,
+#   which can't keep a server-side cursor open across transactions (the next
+#   one may run on another server connection); Django opens them for
+#   QuerySet.iterator(), so they are disabled
+if str(os.environ.get("DB_CONN_POOL", "false")).lower() == "true":
+    DATABASES["default"]["ENGINE"] = "dj_db_conn_pool.backends.postgresql"
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # the pool, not Django, keeps connections
+    DATABASES["default"]["POOL_OPTIONS"] = {
+        "POOL_SIZE": int(os.environ.get("DB_POOL_SIZE", "10")),
+        "MAX_OVERFLOW": int(os.environ.get("DB_POOL_MAX_OVERFLOW", "10")),
+        "RECYCLE": 300,  # seconds
+    }
+if str(os.environ.get("PGBOUNCER", "false")).lower() == "true":
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# ------------------------------------------------------
+# Cache
+# ------------------------------------------------------
+# Listing/detail view data is cached only on Redis (SHOP_VIEW_CACHE): the
+# cache must be shared by all workers/dynos (entries are keyed on a catalog
+# version that admin edits bump, see shop.models.catalog_version) and cheaper
+# to read than the queries it saves, which a DB-table cache is not.
+# Without REDIS_URL Django's per-process default cache stays in place and
+# views query the database directly.
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+SHOP_VIEW_CACHE = bool(REDIS_URL)
+
 # ------------------------------------------------------
 # Password validators
 # ------------------------------------------------------
@@ -129,6 +169,12 @@ LANGUAGES = [
 
 LOCALE_PATHS = [BASE_DIR / "locale"]
 
+# DeepL translations of missing AR/DE fields run after commit in a
+# background thread, so they appear shortly after the save rather than on the
+# next admin page; set to "false" to run them inline (tests/dev). Fills lost
+# to a worker restart are redone by `manage.py backfill_translations`
+SHOP_TRANSLATE_ASYNC = str(os.environ.get("SHOP_TRANSLATE_ASYNC", "true")).lower() == "true"
+
 # ------------------------------------------------------
 # Static & Media
 # ------------------------------------------------------
@@ -136,11 +182,25 @@ STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
-# WhiteNoise: hashed & compressed static files in prod
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
-
-# Media via Cloudinary
-DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
+# Django 5.1+ only reads STORAGES (STATICFILES_STORAGE / DEFAULT_FILE_STORAGE are gone)
+STORAGES = {
+    # Media via Cloudinary (local files when no credentials, e.g. dev/tests:
+    # the Cloudinary backend refuses to import without them)
+    "default": {
+        "BACKEND": (
+            "cloudinary_storage.storage.MediaCloudinaryStorage"
+            if os.environ.get("CLOUDINARY_URL")
+            else "django.core.files.storage.FileSystemStorage"
+        )
+    },
+    # WhiteNoise: hashed & compressed static files in prod. With Brotli
+    # installed, collectstatic also writes .br files next to the .gz ones.
+    # WhiteNoise serves the hashed names with far-future immutable headers;
+    # unhashed names keep its short default max-age
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+# Drop the unhashed copies from STATIC_ROOT after collectstatic
+WHITENOISE_KEEP_ONLY_HASHED_FILES = True
 
 # ------------------------------------------------------
 # Trailing slashes